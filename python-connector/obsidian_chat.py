@@ -1,19 +1,48 @@
 import os
 import sys
+import json
 import asyncio
+import threading
 from pathlib import Path
+from typing import Optional, List, Dict, Any
+from mcp import Tool
 from autogen_ext.models.openai import OpenAIChatCompletionClient
 from autogen_ext.models.anthropic import AnthropicChatCompletionClient
-from autogen_ext.tools.mcp import StdioServerParams, mcp_server_tools
+from autogen_ext.tools.mcp import StdioServerParams, StdioMcpToolAdapter, mcp_server_tools
 from autogen_agentchat.agents import AssistantAgent
 from autogen_core import CancellationToken
 from autogen_agentchat.ui import Console
 
+try:
+    # Optional: faster event loop for streamed agent output and MCP pipes
+    import uvloop
+except ImportError:
+    uvloop = None
+
+# --- Configuration ---
+# Override with OBSIDIAN_VAULT_PATH / OBSIDIAN_MCP_PATH, or update the defaults.
+# Resolved once here so symlinks are not re-walked on every server launch.
+VAULT_PATH = os.path.realpath(
+    os.getenv("OBSIDIAN_VAULT_PATH", "/Users/keshavag/projects/break-down-vault")
+)
+MCP_PATH = os.path.realpath(
+    os.getenv("OBSIDIAN_MCP_PATH", "/Users/keshavag/projects/obsidian-mcp/build/main.js")
+)
+TOOLS_CACHE_FILE = Path.home() / ".cache" / "obsidian-chat" / "tools.json"
+# --- End Configuration ---
+
 class ObsidianChat:
     def __init__(self, vault_path: str, mcp_path: str):
         self.vault_path = vault_path
         self.mcp_path = mcp_path
         self.agent = None
+        self._input_queue: Optional[asyncio.Queue] = None
+
+        # Fail fast instead of waiting for node to start and exit
+        if not os.path.isdir(self.vault_path):
+            raise FileNotFoundError(f"Vault path not found or not a directory: {self.vault_path}")
+        if not os.path.isfile(self.mcp_path):
+            raise FileNotFoundError(f"Obsidian MCP server not found: {self.mcp_path}")
         
         # Check for OpenAI API key
         if not os.getenv("OPENAI_API_KEY"):
@@ -29,8 +58,11 @@ class ObsidianChat:
             )
             
             print("Initializing MCP server and tools...")
-            # Get the tools from the MCP server
-            tools = await mcp_server_tools(obsidian_mcp_server)
+            tools = self._load_cached_tools(obsidian_mcp_server)
+            if tools is None:
+                # Get the tools from the MCP server and cache their schemas for next time
+                tools = await mcp_server_tools(obsidian_mcp_server)
+                self._save_cached_tools(tools)
             print("MCP tools initialized successfully!")
             
             # Create the model client
@@ -78,6 +110,49 @@ Ask for confirmation before performing such operations.""",
             print(f"\nError during setup: {str(e)}")
             raise
 
+    def _tools_cache_key(self) -> Dict[str, Any]:
+        """Identify the MCP server build and vault the cached tool schemas belong to"""
+        return {
+            "mcp_path": self.mcp_path,
+            "mcp_mtime_ns": os.stat(self.mcp_path).st_mtime_ns,
+            "vault_path": self.vault_path,
+        }
+
+    def _load_cached_tools(self, server_params: StdioServerParams) -> Optional[List[StdioMcpToolAdapter]]:
+        """
+        Rebuild the tool adapters from schemas cached by a previous setup(),
+        skipping the node spawn and MCP handshake needed to list them.
+        Each adapter still starts its own server session when a tool is called.
+        """
+        try:
+            with open(TOOLS_CACHE_FILE, 'r') as f:
+                cache = json.load(f)
+            if cache["key"] != self._tools_cache_key():
+                return None  # Server rebuilt or different vault
+            return [
+                StdioMcpToolAdapter(server_params=server_params, tool=Tool.model_validate(tool))
+                for tool in cache["tools"]
+            ]
+        except (FileNotFoundError, KeyError, TypeError, ValueError):
+            # Missing, corrupt or outdated cache (pydantic errors are ValueErrors)
+            return None
+
+    def _save_cached_tools(self, tools: List[StdioMcpToolAdapter]):
+        """Save the discovered tool schemas for the next setup()"""
+        try:
+            TOOLS_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = TOOLS_CACHE_FILE.with_name(TOOLS_CACHE_FILE.name + ".tmp")
+            with open(tmp_file, 'w') as f:
+                json.dump({
+                    "key": self._tools_cache_key(),
+                    "tools": [tool.dump_component().config["tool"] for tool in tools],
+                }, f)
+            # Replace in one step so a crash never leaves a truncated cache file
+            os.replace(tmp_file, TOOLS_CACHE_FILE)
+        except OSError as e:
+            # The cache only speeds up the next start; don't fail this one over it
+            print(f"Warning: could not write tools cache {TOOLS_CACHE_FILE}: {e}")
+
     def print_welcome(self):
         """Print welcome message and available commands"""
         print("\n=== Obsidian Chat Assistant ===")
@@ -104,6 +179,26 @@ Ask for confirmation before performing such operations.""",
             print("MCP server: Running")
             print("Agent: Ready")
 
+    async def read_input(self, prompt: str) -> str:
+        """Async replacement for input() backed by one long-lived stdin reader thread"""
+        if self._input_queue is None:
+            loop = asyncio.get_running_loop()
+            self._input_queue = asyncio.Queue()
+
+            def pump_stdin():
+                for line in sys.stdin:
+                    loop.call_soon_threadsafe(self._input_queue.put_nowait, line)
+                loop.call_soon_threadsafe(self._input_queue.put_nowait, None)  # EOF
+
+            threading.Thread(target=pump_stdin, daemon=True).start()
+
+        print(prompt, end="", flush=True)
+        line = await self._input_queue.get()
+        if line is None:
+            self._input_queue.put_nowait(None)  # Keep reporting EOF on later reads
+            raise EOFError
+        return line.rstrip("\n")
+
     async def chat_loop(self):
         """Main chat loop"""
         self.print_welcome()
@@ -113,8 +208,8 @@ Ask for confirmation before performing such operations.""",
             await self.setup()
             
             while True:
-                # Get user input
-                user_input = input("\nYou: ").strip()
+                # Get user input without blocking the event loop
+                user_input = (await self.read_input("\nYou: ")).strip()
                 
                 # Handle commands
                 if user_input.startswith("/"):
@@ -149,12 +244,8 @@ Ask for confirmation before performing such operations.""",
             print("\nGoodbye!")
 
 async def main():
-    # Use the paths from your environment
-    vault_path = "/Users/keshavag/projects/break-down-vault"  # Update this
-    mcp_path = "/Users/keshavag/projects/obsidian-mcp/build/main.js"  # Update this
-    
-    chat = ObsidianChat(vault_path, mcp_path)
+    chat = ObsidianChat(VAULT_PATH, MCP_PATH)
     await chat.chat_loop()
 
 if __name__ == "__main__":
-    asyncio.run(main()) 
\ No newline at end of file
+    asyncio.run(main(), loop_factory=uvloop.new_event_loop if uvloop else None) 
\ No newline at end of file
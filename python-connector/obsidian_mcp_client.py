@@ -3,7 +3,7 @@ import json
 import subprocess
 import logging
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 
 class ObsidianMCPClient:
     def __init__(
@@ -26,6 +26,7 @@ class ObsidianMCPClient:
         self.mcp_server_path = str(Path(mcp_server_path).absolute())
         self.node_path = node_path
         self.process: Optional[subprocess.Popen] = None
+        self._message_prefixes: Dict[str, str] = {}
         
         # Set up config directory
         if config_dir:
@@ -82,36 +83,67 @@ class ObsidianMCPClient:
         with open(self.config_file, 'w') as f:
             json.dump(config, f, indent=4)
         
-        self.logger.info(f"Updated configuration at {self.config_file}")
+        self.logger.info("Updated configuration at %s", self.config_file)
 
-    def execute_tool(self, tool_name: str, params: Dict[str, Any], vault_name: str) -> Dict[str, Any]:
-        """Execute an MCP tool and return the result"""
+    def _message_prefix(self, vault_name: str) -> str:
+        """Return the serialized constant part of an execute_tool message for a vault"""
+        prefix = self._message_prefixes.get(vault_name)
+        if prefix is None:
+            # Drop the closing brace so the per-call fields can be appended
+            prefix = json.dumps({"type": "execute_tool", "vault": vault_name})[:-1]
+            self._message_prefixes[vault_name] = prefix
+        return prefix
+
+    def execute_tools(self, calls: List[Tuple[str, Dict[str, Any], str]]) -> List[Dict[str, Any]]:
+        """Execute several MCP tools with one batched write and return their results in order"""
         if not self.process:
             raise RuntimeError("MCP server is not running")
             
+        results: List[Dict[str, Any]] = []
+        sent = False
         try:
-            # Format the message
-            message = {
-                "type": "execute_tool",
-                "tool": tool_name,
-                "params": params,
-                "vault": vault_name
-            }
-            
-            # Send the message to the server's stdin
-            self.process.stdin.write(json.dumps(message) + "\n")
+            # Format all messages up front so they go out in a single write;
+            # only the tool name and params are serialized per call
+            payload = "".join(
+                f'{self._message_prefix(vault_name)}, "tool": {json.dumps(tool_name)}, '
+                f'"params": {json.dumps(params)}}}\n'
+                for tool_name, params, vault_name in calls
+            )
+
+            # Send the batch to the server's stdin (json.dumps output is ASCII)
+            sent = True
+            self.process.stdin.write(payload.encode())
             self.process.stdin.flush()
-            
-            # Read the response from stdout
-            response = self.process.stdout.readline()
-            
-            try:
-                return json.loads(response)
-            except json.JSONDecodeError:
-                return {"error": f"Invalid response from server: {response}"}
-                
+
+            # Read one response line per message from stdout
+            for _ in calls:
+                response = self.process.stdout.readline()
+                try:
+                    results.append(json.loads(response))
+                except json.JSONDecodeError:
+                    results.append({"error": f"Invalid response from server: {response.decode(errors='replace')}"})
+            return results
+
         except Exception as e:
-            return {"error": f"Failed to execute tool: {str(e)}"}
+            if sent:
+                # Unread responses would be paired with later calls, so the pipe can't be reused
+                self.logger.error("Lost sync with MCP server, stopping it: %s", e)
+                self._kill_server()
+            # Keep the responses already read; only the rest of the batch failed
+            return results + [{"error": f"Failed to execute tool: {str(e)}"} for _ in calls[len(results):]]
+
+    def _kill_server(self):
+        """Kill the MCP server without waiting for a graceful shutdown"""
+        process, self.process = self.process, None
+        try:
+            process.kill()
+            process.wait(timeout=5)
+        except Exception as e:
+            self.logger.error("Error killing server: %s", e)
+
+    def execute_tool(self, tool_name: str, params: Dict[str, Any], vault_name: str) -> Dict[str, Any]:
+        """Execute an MCP tool and return the result"""
+        return self.execute_tools([(tool_name, params, vault_name)])[0]
 
     def start_server(self):
         """Start the Obsidian MCP server"""
@@ -122,39 +154,39 @@ class ObsidianMCPClient:
         try:
             self.update_config()
             
-            # Start the server process with pipe communication
+            # Start the server process with buffered binary pipes; JSON is
+            # exchanged as bytes so no text-mode decoding layer is needed
             self.process = subprocess.Popen(
                 [self.node_path, self.mcp_server_path, *self.vault_paths],
                 stdin=subprocess.PIPE,
                 stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                bufsize=1  # Line buffered
+                stderr=subprocess.PIPE
             )
             
             self.logger.info("Started Obsidian MCP server")
             
-            # Log server output in background
+            # Log server diagnostics in background
             def log_output(pipe, is_stderr):
-                for line in pipe:
-                    line = line.strip()
+                for raw_line in pipe:
+                    line = raw_line.decode(errors='replace').strip()
                     if not line:  # Skip empty lines
                         continue
                         
-                    # Determine log level based on message content
-                    if is_stderr and any(err in line.lower() for err in ['error', 'failed', 'exception']):
-                        self.logger.error(f"Server: {line}")
-                    elif any(warn in line.lower() for warn in ['warning', 'warn']):
-                        self.logger.warning(f"Server: {line}")
+                    # Determine log level based on message content (lowercased once per line)
+                    lowered = line.lower()
+                    if is_stderr and any(err in lowered for err in ('error', 'failed', 'exception')):
+                        self.logger.error("Server: %s", line)
+                    elif 'warn' in lowered:
+                        self.logger.warning("Server: %s", line)
                     else:
-                        self.logger.info(f"Server: {line}")
+                        self.logger.info("Server: %s", line)
             
+            # Only stderr is pumped; stdout carries tool responses read by execute_tools
             from threading import Thread
-            Thread(target=log_output, args=(self.process.stdout, False), daemon=True).start()
             Thread(target=log_output, args=(self.process.stderr, True), daemon=True).start()
             
         except Exception as e:
-            self.logger.error(f"Failed to start server: {e}")
+            self.logger.error("Failed to start server: %s", e)
             raise
 
     def stop_server(self):
@@ -173,7 +205,7 @@ class ObsidianMCPClient:
             self.process.kill()
             self.process = None
         except Exception as e:
-            self.logger.error(f"Error stopping server: {e}")
+            self.logger.error("Error stopping server: %s", e)
             raise
 
     def __enter__(self):
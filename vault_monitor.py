@@ -1,14 +1,30 @@
 import json
 import os
-from datetime import datetime, timezone
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Set, Optional
+from typing import Any, Dict, Iterator, Set, Optional, Tuple
+
+try:
+    # Optional: faster (de)serialization of large processed-file sets
+    import orjson
+except ImportError:
+    orjson = None
 
 # --- Configuration ---
 VAULT_PATH = Path("/path/to/your/obsidian/vault")  # ! CHANGE THIS !
 STATE_DIR = Path.home() / ".obsidian_monitor_state"
+STATE_FILE = STATE_DIR / "state.json"
+# Separate state files written by older versions, read once for migration
 LAST_RUN_FILE = STATE_DIR / "last_run.txt"
 PROCESSED_FILES_FILE = STATE_DIR / "processed_files.json"
+# Only check files in folders whose entries changed since the last run.
+# Set to True to also pick up files that were edited in place (not created or renamed).
+FULL_SCAN = False
+# Number of new files analysed concurrently (the analyst is I/O-bound).
+# Set to 1 if your primary_analyst is not thread-safe.
+ANALYST_WORKERS = min(32, (os.cpu_count() or 1) * 4)
 # --- End Configuration ---
 
 # Ensure state directory exists
@@ -27,23 +43,55 @@ def primary_analyst(filepath: Path):
 
 # --- Persistence Helper Functions ---
 
-def _load_last_run_time() -> datetime:
-    """Loads the last run timestamp from the state file."""
+def _json_dumps(obj: Any) -> bytes:
+    """Serializes obj to JSON bytes, using orjson when it is installed."""
+    return orjson.dumps(obj) if orjson else json.dumps(obj).encode()
+
+def _json_loads(data: bytes) -> Any:
+    """Parses JSON bytes, using orjson when it is installed."""
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError
+    return orjson.loads(data) if orjson else json.loads(data)
+
+def _load_state() -> Tuple[int, Set[str]]:
+    """Loads the last run timestamp (ns) and the set of processed file paths."""
     try:
-        timestamp_str = LAST_RUN_FILE.read_text()
-        # Assume ISO format with timezone from previous runs
-        return datetime.fromisoformat(timestamp_str)
-    except (FileNotFoundError, ValueError):
+        state = _json_loads(STATE_FILE.read_bytes())
+        return int(state["last_run_ns"]), set(state["processed_files"])
+    except FileNotFoundError:
+        # No combined state yet: migrate from the legacy state files
+        return _load_last_run_ns(), _load_processed_files()
+    except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+        # Start over if the state file content is invalid
+        return 0, set()
+
+def _save_state(last_run_ns: int, processed_files: Set[str]):
+    """Saves the last run timestamp and processed file paths in one atomic write."""
+    tmp_file = STATE_FILE.with_name(STATE_FILE.name + ".tmp")
+    # Store integer nanoseconds so the timestamp compares directly with st_mtime_ns
+    tmp_file.write_bytes(_json_dumps({"last_run_ns": last_run_ns, "processed_files": list(processed_files)}))
+    # Replace in one step so a crash never leaves a truncated state file
+    os.replace(tmp_file, STATE_FILE)
+
+def _load_last_run_ns() -> int:
+    """Loads the last run timestamp (nanoseconds since the epoch) from the legacy state file."""
+    try:
+        timestamp_str = LAST_RUN_FILE.read_text().strip()
+        try:
+            return int(timestamp_str)
+        except ValueError:
+            # Older state files hold an ISO timestamp with timezone
+            run_time = datetime.fromisoformat(timestamp_str)
+            return (run_time - datetime.fromtimestamp(0, tz=timezone.utc)) // timedelta(microseconds=1) * 1000
+    except (FileNotFoundError, ValueError, TypeError):
         # Return epoch if file doesn't exist or content is invalid
-        return datetime.fromtimestamp(0, tz=timezone.utc)
+        return 0
 
-def _save_last_run_time(run_time: datetime):
-    """Saves the current run timestamp to the state file."""
-    # Store in ISO format with UTC timezone for consistency
-    LAST_RUN_FILE.write_text(run_time.astimezone(timezone.utc).isoformat())
+def _format_ns(timestamp_ns: int) -> str:
+    """Formats a nanosecond timestamp as a UTC datetime for log messages."""
+    return str(datetime.fromtimestamp(timestamp_ns / 1e9, tz=timezone.utc))
 
 def _load_processed_files() -> Set[str]:
-    """Loads the set of processed file paths from the state file."""
+    """Loads the set of processed file paths from the legacy state file."""
     try:
         with open(PROCESSED_FILES_FILE, 'r') as f:
             # Store absolute paths as strings for consistency
@@ -51,14 +99,45 @@ def _load_processed_files() -> Set[str]:
     except (FileNotFoundError, json.JSONDecodeError):
         return set()
 
-def _save_processed_files(processed_files: Set[str]):
-    """Saves the set of processed file paths to the state file."""
-    with open(PROCESSED_FILES_FILE, 'w') as f:
-        # Convert Path objects or ensure strings before saving
-        json.dump(list(processed_files), f)
-
 # --- Core Monitoring Logic ---
 
+def _iter_markdown_entries(root: Path, changed_since_ns: Optional[int] = None) -> Iterator[os.DirEntry]:
+    """
+    Yields a DirEntry for every markdown file under root.
+    Uses an explicit-stack os.scandir walk so file type and stat info come
+    from the directory listing instead of separate per-file syscalls.
+    If changed_since_ns (epoch nanoseconds) is given, only files in directories whose
+    own mtime is newer are yielded; every directory is still listed because a
+    directory's mtime does not change when something deeper in its subtree does.
+    """
+    stack = [str(root)]
+    while stack:
+        dir_path = stack.pop()
+        try:
+            # Creating, deleting or renaming an entry bumps its directory's mtime
+            dir_changed = changed_since_ns is None or os.stat(dir_path).st_mtime_ns > changed_since_ns
+            with os.scandir(dir_path) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        # Skip dot-folders (.obsidian, .trash, .git), which Obsidian does not index
+                        if not entry.name.startswith('.'):
+                            stack.append(entry.path)
+                    elif dir_changed and entry.name.endswith('.md'):
+                        yield entry
+        except OSError as e:
+            print(f"Error accessing directory {dir_path}: {e}")
+
+def _run_analyst(md_file: Path) -> bool:
+    """Runs primary_analyst on a file, returning whether it succeeded."""
+    try:
+        primary_analyst(md_file)
+        return True
+    except Exception as e:
+        print(f"Error processing file {md_file}: {e}")
+        # Decide if you want to add it to processed_files even on error
+        # return True # Optional: uncomment to avoid retrying failed files
+        return False
+
 def find_new_markdown_files():
     """
     Finds new markdown files in the vault since the last run
@@ -68,51 +147,55 @@ def find_new_markdown_files():
         print(f"Error: Vault path not found or not a directory: {VAULT_PATH}")
         return
 
-    last_run_time = _load_last_run_time()
-    processed_files = _load_processed_files()
-    current_run_time = datetime.now(timezone.utc) # Use timezone-aware datetime
+    last_run_ns, processed_files = _load_state()
+    current_run_ns = time.time_ns()  # Plain int, compared directly with st_mtime_ns
+    new_files: Dict[str, Path] = {}  # Resolved path string -> file to analyse
     new_files_found = False
 
-    print(f"Checking for files modified since: {last_run_time}")
-
-    # Iterate through all markdown files recursively
-    for md_file in VAULT_PATH.glob('**/*.md'):
-        if not md_file.is_file():
-            continue
+    print(f"Checking for files modified since: {_format_ns(last_run_ns)}")
 
+    # Iterate through markdown files recursively, skipping folders with no new entries
+    changed_since_ns = None if FULL_SCAN else last_run_ns
+    for entry in _iter_markdown_entries(VAULT_PATH.resolve(), changed_since_ns):
         try:
-            # Get modification time (timezone-aware)
-            mtime_timestamp = md_file.stat().st_mtime
-            mod_time = datetime.fromtimestamp(mtime_timestamp, tz=timezone.utc)
-
-            # Use resolved absolute path string for reliable tracking
-            abs_path_str = str(md_file.resolve())
-
-            # Condition 1: File modified since last run
-            # Condition 2: File not already processed
-            if mod_time > last_run_time and abs_path_str not in processed_files:
-                try:
-                    primary_analyst(md_file)
-                    processed_files.add(abs_path_str) # Add after successful analysis
-                    new_files_found = True
-                except Exception as e:
-                    print(f"Error processing file {md_file}: {e}")
-                    # Decide if you want to add it to processed_files even on error
-                    # processed_files.add(abs_path_str) # Optional: uncomment to avoid retrying failed files
+            if not entry.is_file():
+                continue
+
+            # Condition 1: File modified since last run (integer nanoseconds,
+            # no per-file datetime objects); DirEntry caches the stat
+            if entry.stat().st_mtime_ns <= last_run_ns:
+                continue
+
+            # Use resolved absolute path string for reliable tracking. The walk
+            # starts at the resolved vault root and does not follow symlinked
+            # folders, so only symlinked notes need an explicit realpath
+            abs_path_str = os.path.realpath(entry.path) if entry.is_symlink() else entry.path
+
+            # Condition 2: File not already processed (or already queued via a symlink)
+            if abs_path_str not in processed_files:
+                new_files.setdefault(abs_path_str, Path(entry.path))
 
         except OSError as e:
-            print(f"Error accessing file {md_file}: {e}")
+            print(f"Error accessing file {entry.path}: {e}")
             continue # Skip to next file if stat fails
 
+    # Analyse new files concurrently instead of one after another
+    if new_files:
+        with ThreadPoolExecutor(max_workers=ANALYST_WORKERS) as executor:
+            results = executor.map(_run_analyst, new_files.values())
+            for abs_path_str, succeeded in zip(new_files, results):
+                if succeeded:
+                    processed_files.add(abs_path_str) # Add after successful analysis
+                    new_files_found = True
+
     if new_files_found:
         print("Saving updated processed files list.")
-        _save_processed_files(processed_files)
     else:
         print("No new markdown files found to process.")
 
-    # Always save the current run time for the next execution
-    _save_last_run_time(current_run_time)
-    print(f"Finished check. Next check will look for files modified after: {current_run_time}")
+    # Always save the current run time (and processed files) for the next execution
+    _save_state(current_run_ns, processed_files)
+    print(f"Finished check. Next check will look for files modified after: {_format_ns(current_run_ns)}")
 
 
 if __name__ == "__main__":